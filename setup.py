@@ -1,7 +1,12 @@
 #!/usr/bin/python3
 
 import os
-from setuptools import setup, find_packages
+from setuptools import Extension, setup, find_packages
+
+try:
+    from Cython.Build import cythonize
+except ImportError:
+    cythonize = None
 
 
 
@@ -15,9 +20,24 @@ with open(os.path.join(here, 'README.md'), 'r') as fp:
     readme = fp.read()
 
 requires = [
-    'umsg>=1.0.4'
+    'umsg>=1.0.4',
+    'contextvars;python_version<"3.7"'
 ]
 
+# optional compiled speedups, arbiter falls back to pure Python without them;
+# built from the .pyx with Cython, otherwise from the .c shipped in the sdist
+ext_modules = []
+
+if cythonize and os.path.exists(os.path.join(here, 'src', 'arbiter', '_csvfast.pyx')):
+    ext_modules = cythonize([Extension('arbiter._csvfast', ['src/arbiter/_csvfast.pyx'])])
+elif os.path.exists(os.path.join(here, 'src', 'arbiter', '_csvfast.c')):
+    ext_modules = [Extension('arbiter._csvfast', ['src/arbiter/_csvfast.c'])]
+
+# cythonize drops the flag, a failed build (e.g. no compiler) is then
+# skipped rather than aborting the install
+for ext in ext_modules:
+    ext.optional = True
+
 setup(
     name=about['__title__'],
     version=about['__version__'],
@@ -50,5 +70,6 @@ setup(
     include_package_data=True,
     python_requires=">=3.6",
     install_requires=requires,
+    ext_modules=ext_modules,
     license=about['__license__'],
 )
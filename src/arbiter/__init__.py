@@ -2,22 +2,32 @@
 # SPDX-License-Identifier: LGPL-3.0-or-later
 
 import atexit
-from collections import defaultdict
+import contextlib
+import contextvars
+from collections.abc import Mapping
 import datetime
 from decimal import Decimal
+import functools
+import itertools
 import json
 import logging
 from logging import StreamHandler
 from logging.handlers import RotatingFileHandler
 import multiprocessing
 import os
+import pickle
+from queue import Empty
 import re
+import string
 import sys
 import threading
-import time
 from timeit import default_timer as timer
 import traceback
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
 import requests
 from requests.packages.urllib3.exceptions import InsecureRequestWarning
 import umsg
@@ -27,7 +37,6 @@ from arbiter import auth
 from arbiter import handlers
 from arbiter import registry
 from arbiter import exceptions
-from arbiter.dict import CaseInsensitiveDict
 from .__about__ import (__author__, __copyright__, __description__,
                         __license__, __title__, __version__)
 
@@ -64,6 +73,15 @@ LOG_FILENAME = None
 LOG_FILEMODE = None
 LOG_ENCODING = None
 
+_DATE_FIELDS = frozenset(('date', 'time', 'timestamp'))
+
+# date substitution values shared by strings parsed during a process run
+_PARSE_CONTEXT = contextvars.ContextVar('_PARSE_CONTEXT', default=None)
+
+_MEM_RE = re.compile(r'^\d+[BKMGTPEZY]B?$', re.IGNORECASE)
+_MEM_UNITS = ('B', 'K', 'M', 'G', 'T', 'P', 'E', 'Z', 'Y')
+_MEM_IDX = {u: i for i, u in enumerate(_MEM_UNITS)}
+
 __SYSTEM_HANDLERS = ['CSV', 'JSON', 'EMAIL']
 __HANDLERS = {
     'CSV': handlers.CsvFile,
@@ -80,20 +98,73 @@ __AUTH = {
 }
 AUTH = registry.Registry(__SYSTEM_AUTH, __AUTH)
 
+# worker process logger, set by the pool initializer
+_WORKER_LOGGER = None
+
+# worker process job start notices, set by the pool initializer
+_WORKER_STARTED = None
+
+# seconds between worker liveness checks while waiting on results
+_POLL_INTERVAL = 0.5
+
+# unique run identifiers, used to tell apart concurrent runs sharing a queue
+_RUN_IDS = itertools.count()
+
+
+
+def _worker_init(env, queue, started=None):
+    """
+    Worker process initializer, applies the parent environment and log queue,
+    and the queue job start notices are sent on.
+    """
+    global _WORKER_LOGGER, _WORKER_STARTED
+
+    if env is not None:
+        os.environ.update(env)
+
+    logger = logging.getLogger(__name__+'_worker')
+    logger.setLevel(logging.DEBUG)
+
+    # forked workers inherit the parent's handlers, which are replaced
+    for h in logger.handlers[:]:
+        logger.removeHandler(h)
+
+    logger.addHandler(logging.handlers.QueueHandler(queue))
+    _WORKER_LOGGER = logger
+    _WORKER_STARTED = started
 
 
 class WorkflowJobPool(LoggingMixin):
     __slots__ = [
+        '_pool',
         'config',
         'handler',
         'logqueue',
+        'names',
         'processes',
         'results',
-        'sleep_interval',
+        'spawn',
         'success',
+        'tasks',
         'timeout'
     ]
 
+    # persistent worker pools, keyed by (processes, start method, log queue,
+    # worker function)
+    _pool_cache = {}
+
+    # environment each cached pool's workers were started with, or None once
+    # the environment has changed
+    _pool_env = {}
+
+    # job start notice queue for each cached pool, and the worker pid each
+    # job started on, keyed by (run, task index)
+    _pool_started = {}
+    _started_lock = threading.Lock()
+
+    # shared worker log queues, keyed by start method
+    _logqueues = {}
+
     def __init__(self, config=None, handler=None, processes=None,
                  logqueue=None):
         super().__init__('Workflow')
@@ -101,67 +172,234 @@ class WorkflowJobPool(LoggingMixin):
         self.config = config
         self.success = 0
         self.handler = handler
-        self.logqueue = logqueue
-        self.sleep_interval = config.get('sleep_interval', 10)
         self.report_timeout = config.get('report_timeout', 300)
-        self.response_timeout = config.get('response_timeout', 60)
-        self.results = defaultdict(lambda: None)
+        self.spawn = config.get('spawn', False)
+        self.logqueue = self.get_logqueue(self.spawn) if logqueue is None else logqueue
+        self.names = []
+        self.results = {}
+        self.tasks = None
+        self._pool = None
 
         cpus = multiprocessing.cpu_count()*2 if processes is None else processes
         self.processes = len(config['sources']) if 0 < len(config['sources']) < cpus else cpus
 
     @staticmethod
-    def job_wrapper(func, handler, config, queue, env):
-        os.environ = env
-        logger = logging.getLogger(__name__+'_worker')
-        logger.setLevel(logging.DEBUG)
-
-        # ensure subsequent re-use of the subprocess doesn't duplicate handlers
-        if not logger.hasHandlers():
-            logger.addHandler(logging.handlers.QueueHandler(queue))
+    def start_method(spawn=False):
+        """Returns the pool start method, `fork` where available unless `spawn` is forced."""
+        if spawn or 'fork' not in multiprocessing.get_all_start_methods():
+            return 'spawn'
+
+        return 'fork'
+
+    @classmethod
+    def get_logqueue(cls, spawn=False):
+        """
+        Returns the shared worker log queue for the start method, creating it
+        on first use.
+
+        Args:
+            spawn (bool, optional): Force the `spawn` start method.
+        """
+        method = cls.start_method(spawn)
+
+        if method not in cls._logqueues:
+            cls._logqueues[method] = multiprocessing.get_context(method).Queue()
+
+        return cls._logqueues[method]
+
+    @classmethod
+    def pool_key(cls, processes, logqueue, spawn=False, func=None):
+        """Returns the pool cache key for the given pool parameters."""
+        return (processes, cls.start_method(spawn), id(logqueue), func)
+
+    @classmethod
+    def get_pool(cls, processes, logqueue, spawn=False, func=None):
+        """
+        Returns a persistent worker pool, creating it on first use. Pools are
+        reused across runs, and terminated at interpreter exit, or when a run
+        leaves jobs behind. The `fork` start method is used where available,
+        unless `spawn` is requested. Workers receive the current environment
+        and the log queue at startup; later environment changes are sent with
+        each job, see :py:meth:`wait`.
+
+        A pool is kept for each worker function, so forked workers always have
+        the function they're sent. Each pool's processes live until exit, so
+        worker functions should be long lived, rather than created per run.
+        Handler classes are also sent by reference, and must be registered
+        before the first run.
+
+        Args:
+            processes (int): Number of worker processes.
+            logqueue (Queue): Queue to forward worker log records to.
+            spawn (bool, optional): Force the `spawn` start method.
+            func (function, optional): Worker function the pool is used for.
+        """
+        key = cls.pool_key(processes, logqueue, spawn, func)
+        pool = cls._pool_cache.get(key)
+
+        if pool is None:
+            env = os.environ.copy()
+            ctx = multiprocessing.get_context(key[1])
+            # written synchronously, so a notice survives its worker dying
+            started = ctx.SimpleQueue()
+            pool = ctx.Pool(processes,
+                            initializer=_worker_init,
+                            initargs=(env, logqueue, started),
+                            maxtasksperchild=None)
+            cls._pool_cache[key] = pool
+            cls._pool_env[key] = env
+            cls._pool_started[key] = (started, {})
+            atexit.register(cls.close_pool, key)
+
+        return pool
+
+    @classmethod
+    def close_pool(cls, key):
+        """Terminates and evicts a cached pool, along with any jobs still running."""
+        pool = cls._pool_cache.pop(key, None)
+        cls._pool_env.pop(key, None)
+        cls._pool_started.pop(key, None)
+
+        if pool is not None:
+            pool.terminate()
+
+    @classmethod
+    def started(cls, key):
+        """
+        Collects the job start notices sent by a cached pool's workers, and
+        returns the worker pid of each started job, keyed by (run, task index).
+        Notices are collected by whichever run calls first, so runs sharing the
+        pool see each other's.
+        """
+        queue, started = cls._pool_started.get(key, (None, {}))
+
+        if queue is not None:
+            with cls._started_lock:
+                while not queue.empty():
+                    run, index, pid = queue.get()
+                    started[run, index] = pid
+
+        return started
 
+    @staticmethod
+    def job_wrapper(func, handler, config):
         hdlr = handler(config)
 
-        return func(hdlr, config, logger)
+        return func(hdlr, config, _WORKER_LOGGER)
+
+    @staticmethod
+    def job_entry(task, env=None, serialize=False, run=None):
+        """
+        Pool entry point. Jobs are returned tagged with their task index, so
+        results may be collected in completion order. Errors are returned rather
+        than raised, so one failed job does not interrupt collection of the others.
+        If given, `env` replaces the worker's environment before the job runs.
+        With `serialize`, successful results are returned pickled, so a result
+        that can't be pickled fails its own job rather than the pool's batch.
+        With `run`, a start notice is sent before the job runs, see :py:meth:`started`.
+        """
+        index, func, handler, config = task
+
+        if run is not None and _WORKER_STARTED is not None:
+            _WORKER_STARTED.put((run, index, os.getpid()))
+
+        if env is not None and env != os.environ:
+            os.environ.clear()
+            os.environ.update(env)
+
+        try:
+            res = WorkflowJobPool.job_wrapper(func, handler, config)
+
+            return index, True, pickle.dumps(res, pickle.HIGHEST_PROTOCOL) if serialize else res
+        except Exception:
+            return index, False, traceback.format_exc()
+
+    def wait(self, pool, tasks, start):
+        """
+        Submits the tasks to the pool as one batch, and collects them until all
+        are done, or the report timeout is exceeded. Returns the indexes of the
+        tasks lost to a worker process exiting, which are waited on only until
+        every other task is done. The current environment is sent with each
+        task if it has changed since the pool's workers were started.
+        """
+        key = self.pool_key(self.processes, self.logqueue, self.spawn, tasks[0][1])
+        run = next(_RUN_IDS)
+        pending = {t[0] for t in tasks}
+        received = 0
+        lost = set()
+        env = None
+        errors = []
+
+        if os.environ != self._pool_env.get(key):
+            env = os.environ.copy()
+            # workers may now hold differing environments, so it's always sent
+            self._pool_env[key] = None
 
-    @property
-    def is_complete(self):
-        if not self.results:
-            return True
+        jobs = pool.imap_unordered(functools.partial(self.job_entry, env=env,
+                                                     serialize=True, run=run), tasks)
+
+        while received + len(lost) < len(tasks):
+            remaining = self.report_timeout - (timer() - start)
+
+            if remaining <= 0:
+                break
 
-        for k in self.results:
-            #if not self.results[k].ready():
-            #   return False
             try:
-                if self.results[k].successful():
-                    continue
-            except (ValueError, AssertionError):
-                return False
+                index, success, value = jobs.next(timeout=min(remaining, _POLL_INTERVAL))
+            except multiprocessing.TimeoutError:
+                # workers never exit on their own, so a started job whose worker
+                # is gone is lost, while jobs on other workers run on
+                started = self.started(key)
+                alive = {p.pid for p in multiprocessing.active_children()}
+                lost = {i for i in pending if (run, i) in started and started[run, i] not in alive}
+                continue
+            except Exception:
+                # pool errors, such as an unpicklable task, carry no task index
+                received += 1
+                errors.append(traceback.format_exc())
+                continue
 
-        return True
+            received += 1
+            pending.discard(index)
+            lost.discard(index)
 
-    def wait(self):
-        start = timer()
-        elapsed = 0
+            try:
+                self.results[index] = (success, pickle.loads(value) if success else value)
+            except Exception:
+                self.results[index] = (False, traceback.format_exc())
 
-        while not self.is_complete and elapsed < self.report_timeout:
-            time.sleep(self.sleep_interval)
-            elapsed = int(str(datetime.timedelta(seconds=int(timer() - start)).total_seconds())[:-2])
+        # start notices precede their results, so this run's are all collected
+        started = self.started(key)
+
+        with self._started_lock:
+            for t in tasks:
+                started.pop((run, t[0]), None)
+
+        # every other task has reported, so any without a result hit a pool error
+        if received + len(lost) == len(tasks):
+            for t in tasks:
+                if t[0] not in lost:
+                    self.results.setdefault(t[0], (False, ''.join(errors)))
+
+        return lost
 
     def get_results(self):
         results = []
         errors = []
 
-        for k in self.results:
-            try:
-                msg = None
-                res = self.results[k].get(self.response_timeout)
-                results.append(res)
-            except multiprocessing.context.TimeoutError:
+        for i, k in enumerate(self.names):
+            msg = None
+
+            if i not in self.results:
                 msg = f"Workflow results timeout exceeded for '{k}'"
-            except Exception as e:
-                msg = f"Workflow for '{k}' failed"
-                self.log(traceback.format_exc(), 'error')
+            else:
+                success, res = self.results[i]
+
+                if success:
+                    results.append(res)
+                else:
+                    msg = f"Workflow for '{k}' failed"
+                    self.log(res, 'error')
 
             if msg is not None:
                 self.log(msg, level='error')
@@ -169,31 +407,70 @@ class WorkflowJobPool(LoggingMixin):
 
         return results, errors
 
-    def run(self, handler=None):
+    def prepare(self, handler=None):
+        """
+        Resolves the dispatch plan, and acquires the worker pool if the plan
+        requires one. Called by :py:meth:`run` if not called beforehand, which
+        allows the pool to be forked before any other threads are started.
+        """
         func = self.handler if handler is None else handler
         sources = self.config['sources']
 
-        with multiprocessing.get_context('spawn').Pool(self.processes) as pool:
-            self.log(f"{len(sources)} sources, {self.processes} processes", 'debug')
+        # resolve the dispatch plan up front, before any worker is involved
+        plan = [(s, HANDLERS.get(s['handler'])) for s in sources]
+        known = [(s, klass) for s, klass in plan if klass is not None]
+        self.tasks = [(i, func, klass, s) for i, (s, klass) in enumerate(known)]
+        unknown = sorted({s['handler'] for s, klass in plan if klass is None})
 
-            for s in sources:
-                name = s['resource']
+        if unknown:
+            self.log(f"No registered handler called: {', '.join(unknown)}")
 
-                if s['handler'] in HANDLERS:
-                    klass = HANDLERS[s['handler']]
+        # results are keyed by task index, as resources need not be unique
+        self.names = [t[3]['resource'] for t in self.tasks]
+        self.results = {}
+        self.log(f"{len(sources)} sources, {self.processes} processes", 'debug')
 
-                    self.results[name] = pool.apply_async(self.job_wrapper,
-                                         args=(self.handler,
-                                               klass,
-                                               s,
-                                               self.logqueue,
-                                               os.environ.copy())
-                                     )
-                else:
-                    self.log(f"No registered handler called '{s['handler']}'")
+        # a single job gains nothing from a pool, so it's executed in-process
+        if len(self.tasks) > 1 and self.processes > 1:
+            self._pool = self.get_pool(self.processes, self.logqueue, self.spawn, func)
+        else:
+            self._pool = None
+
+    def run(self, handler=None):
+        if self.tasks is None or handler is not None:
+            self.prepare(handler)
+
+        if self._pool is None:
+            _worker_init(None, self.logqueue)
+
+            for t in self.tasks:
+                index, success, value = self.job_entry(t)
+                self.results[index] = (success, value)
+
+            self.tasks = None
+            return
+
+        func = self.tasks[0][1]
+        key = self.pool_key(self.processes, self.logqueue, self.spawn, func)
+        start = timer()
+        lost = self.wait(self._pool, self.tasks, start)
+        self._pool = None
 
-            self.wait()
-        # pool closed ---
+        # the pool replaces exited workers, so only the lost jobs are run again,
+        # and only once
+        if lost:
+            self.log(f"Worker process exited unexpectedly, retrying {len(lost)} jobs", 'warning')
+            pool = self.get_pool(self.processes, self.logqueue, self.spawn, func)
+            lost = self.wait(pool, [t for t in self.tasks if t[0] in lost], start)
+
+        for i in lost:
+            self.results[i] = (False, 'Worker process exited unexpectedly')
+
+        # stuck jobs would otherwise occupy the pool's workers in later runs
+        if len(self.results) < len(self.names):
+            self.close_pool(key)
+
+        self.tasks = None
 
 
 class Process(LoggingMixin):
@@ -214,6 +491,7 @@ class Process(LoggingMixin):
         worker (function, optional): Function to use for source processing.
     """
     __slots__ = [
+        '_atexit_fns',
         'config',
         'files',
         'worker',
@@ -232,21 +510,44 @@ class Process(LoggingMixin):
         self.worker = worker or self.default_worker
         self.results = None
         self.files = None
+        self._atexit_fns = {}
 
         init_logging(self.config)
+        atexit.register(self._run_atexit)
+
+    def _run_atexit(self):
+        for fn in self._atexit_fns.values():
+            fn()
 
     @staticmethod
-    def logging_thread(logger, queue):
+    def logging_thread(logger, queue, sentinel=None):
+        """
+        Logs queued worker records until `sentinel` is received. The queue is
+        shared by all runs using the same start method, so other runs' sentinels
+        are put back for their own threads, and other runs' records are logged.
+        """
         umsg.log('Workflow logging enabled', level='debug', logger=logger)
+        done = False
 
-        while True:
-            record = queue.get()
+        while not done:
+            # block for the next record, then drain whatever else is waiting
+            batch = [queue.get()]
 
-            if record is None:
-                umsg.log('Workflow logging disabled', level='debug', logger=logger)
-                break
+            try:
+                while True:
+                    batch.append(queue.get_nowait())
+            except Empty:
+                pass
+
+            for record in batch:
+                if isinstance(record, logging.LogRecord):
+                    umsg.log(record.message, level=record.levelname, prefix=record.process, logger=logger)
+                elif record == sentinel:
+                    done = True
+                else:
+                    queue.put(record)
 
-            umsg.log(record.message, level=record.levelname, prefix=record.process, logger=logger)
+        umsg.log('Workflow logging disabled', level='debug', logger=logger)
 
     @staticmethod
     def default_worker(source, config, logger):
@@ -272,14 +573,16 @@ class Process(LoggingMixin):
             errors = []
 
         for n in config:
-            klass = n['handler']
+            name = n['handler']
+            klass = HANDLERS.get(name)
 
-            if klass not in HANDLERS:
-                self.raise_error(f"Unknown handler: {klass}", UnknownHandlerError)
+            if klass is None:
+                self.raise_error(f"Unknown handler: {name}", exceptions.UnknownHandlerError)
+                continue
 
             if (not errors and n.get('on_success', False)) or \
             (errors and n.get('on_failure', False)):
-                handler = HANDLERS[klass](n, files=files, errors=errors)
+                handler = klass(n, files=files, errors=errors)
             else:
                 continue
 
@@ -307,29 +610,36 @@ class Process(LoggingMixin):
         allerrors = []
         self.pre()
 
-        for o in self.config['outputs']:
-            klass = o['handler']
+        for i, o in enumerate(self.config['outputs']):
+            name = o['handler']
+            klass = HANDLERS.get(name)
             errors = []
+            fname = None
             msg = None
             exc = False
 
-            try:
-                handler = HANDLERS[klass](o, **self.config.get('options', {}))
-                handler.set(self.results)
-                atexit.register(handler.atexit)
-
-                if getattr(handler, 'filename', None):
-                    self.files.append(handler.filename)
-            except KeyError:
-                msg = f"Unknown output handler: {klass}"
-                err = UnknownHandlerError
-            except AttributeError as e:
-                msg = e
-                err = AttributeError
-            except Exception as e:
-                exc = sys.exc_info()
-                msg = f"Exception occurred: {e}"
-                err = Exception
+            if klass is None:
+                msg = f"Unknown output handler: {name}"
+                err = exceptions.UnknownHandlerError
+            else:
+                try:
+                    handler = klass(o, **self.config.get('options', {}))
+                    handler.set(self.results)
+                    fname = getattr(handler, 'filename', None)
+
+                    # one exit callback per file, or per output if it has none,
+                    # so repeated runs don't stack
+                    self._atexit_fns[fname or i] = handler.atexit
+
+                    if fname:
+                        self.files[fname] = None
+                except AttributeError as e:
+                    msg = e
+                    err = AttributeError
+                except Exception as e:
+                    exc = sys.exc_info()
+                    msg = f"Exception occurred: {e}"
+                    err = Exception
 
             if msg:
                 self.raise_error(msg, err, exc)
@@ -338,7 +648,7 @@ class Process(LoggingMixin):
             # output specific notifications
             if 'notifications' in o:
                 self.notify(o['notifications'],
-                            files=[handler.filename],
+                            files=[fname] if fname else [],
                             errors=errors)
 
             allerrors.extend(errors)
@@ -350,40 +660,48 @@ class Process(LoggingMixin):
     def run(self):
         """Execute the configured process."""
         self.results = []
-        self.files = []
+        self.files = {}
         self.log('Process initiated')
 
-        # creates a logging thread for queued messages
-        log_queue = multiprocessing.Manager().Queue()
-        logthread = threading.Thread(target=self.logging_thread,
-                                     args=(umsg.get_attr('logger'), log_queue)
-                                    )
-        logthread.start()
-
-        self.log('Gathering source data')
         workflow = WorkflowJobPool(config=self.config,
-                                   handler=self.worker,
-                                   logqueue=log_queue
+                                   handler=self.worker
                                   )
-        workflow.run()
-        results, errors = workflow.get_results()
-
-        # closeout our logging thread
-        log_queue.put_nowait(None)
-        logthread.join()
 
-        if not errors:
-            self.log('Generating process output')
-            errors = self.generate(results)
+        # the pool is forked before the logging thread is started
+        workflow.prepare()
 
-            if 'notifications' in self.config:
-                self.notify(self.config['notifications'],
-                            files=self.files,
-                            errors=errors)
+        # creates a logging thread for queued messages, stopped by a sentinel
+        # unique to this run
+        log_queue = workflow.logqueue
+        sentinel = next(_RUN_IDS)
+        logthread = threading.Thread(target=self.logging_thread,
+                                     args=(umsg.get_attr('logger'), log_queue, sentinel)
+                                    )
+        logthread.start()
 
-        if errors and 'notifications' in self.config:
-            self.log('Sending error notifications')
-            self.notify(self.config['notifications'], errors=errors)
+        try:
+            self.log('Gathering source data')
+            workflow.run()
+            results, errors = workflow.get_results()
+        finally:
+            # closeout our logging thread
+            log_queue.put_nowait(sentinel)
+            logthread.join()
+
+        # all outputs and notifications of a run share one timestamp
+        with _parse_context():
+            if not errors:
+                self.log('Generating process output')
+                errors = self.generate(results)
+
+                if 'notifications' in self.config:
+                    self.notify(self.config['notifications'],
+                                files=list(self.files),
+                                errors=errors)
+
+            if errors and 'notifications' in self.config:
+                self.log('Sending error notifications')
+                self.notify(self.config['notifications'], errors=errors)
 
         self.log('Process complete')
 
@@ -396,8 +714,33 @@ class Process(LoggingMixin):
 
 
 def unit_cast(value, ufrom, uto, factor, unit_list, precision=False):
-    """Generic linear unit conversion routine"""
-    offset = unit_list.index(uto) - unit_list.index(ufrom)
+    """
+    Generic linear unit conversion routine
+
+    Args:
+        unit_list (list or dict): Ordered list of units, or a mapping of unit
+            to its position in the ordering.
+
+    Returns:
+        An :py:class:`int` for base 2 (`factor` 1024) conversions of whole
+        values that are exact without `precision`, otherwise a :py:class:`~decimal.Decimal`.
+    """
+    index = unit_list.__getitem__ if isinstance(unit_list, Mapping) else unit_list.index
+
+    try:
+        offset = index(uto) - index(ufrom)
+    except KeyError as e:
+        raise ValueError(f"'{e.args[0]}' is not a recognized unit") from None
+
+    # base 2 conversions of whole values are exact integer shifts
+    if factor == 1024 and not precision and isinstance(value, int):
+        shift = offset * 10
+
+        if shift <= 0:
+            return value << -shift
+        elif not value & ((1 << shift) - 1):
+            return value >> shift
+
     chg = Decimal(pow(factor, abs(offset)))
 
     res = value * chg if offset <= 0 else value * (1/chg)
@@ -406,12 +749,15 @@ def unit_cast(value, ufrom, uto, factor, unit_list, precision=False):
 
 
 def mem_cast(value, unit=None, src=None):
-    """Memory size (base 2) unit conversion"""
+    """
+    Memory size (base 2) unit conversion, see :py:func:`unit_cast` for the
+    return type.
+    """
     value = value.replace(' ', '')
     unit = 'G' if not unit else unit[0]
     src = 'B' if not src else src[0]
 
-    if re.match(r'^[\d]+[BKMGTPEZY]{1}[B]?$', value, re.IGNORECASE):
+    if _MEM_RE.match(value):
         src = value[-2] if value[-2].isalpha() else value[-1]
         value = value[:-2] if value[-2].isalpha() else value[:-1]
     elif not value.isnumeric():
@@ -421,33 +767,74 @@ def mem_cast(value, unit=None, src=None):
                      src.upper(),
                      unit.upper(),
                      1024,
-                     ['B', 'K', 'M', 'G', 'T', 'P', 'E', 'Z', 'Y']
+                     _MEM_IDX
                      )
 
 
-def parse_string(input, **kwargs):
+def parse_string(input, _now=None, **kwargs):
     """
     String paramter substitution resolver
 
     Args:
         input (str): Input string to parse.
+        _now (datetime, optional): Time to use for date substitutions. Defaults
+            to the current process run snapshot, if any, otherwise the current
+            time.
         **kwargs (dict): Keyword pairs of additional values to substitute.
     """
     if input is not None and '{' in input:
-        return input.format(
-            date=datetime.date.today().strftime(FORMAT_DATE),
-            time=datetime.datetime.now().strftime(FORMAT_TIME),
-            timestamp=datetime.datetime.now().strftime(FORMAT_TIMESTAMP),
-            **kwargs
-        )
+        dates = _template_fields(input) & _DATE_FIELDS
+        values = {}
+
+        if dates:
+            context = _PARSE_CONTEXT.get() if _now is None else None
+
+            if context is not None:
+                values = {f: context[f] for f in dates}
+            else:
+                values = _date_values(_now or datetime.datetime.now(), dates)
+
+        return input.format(**values, **kwargs)
     else:
         return input
 
 
+def _date_values(now, fields=_DATE_FIELDS):
+    """Formats the date substitution values for the given time"""
+    formats = {
+        'date': FORMAT_DATE,
+        'time': FORMAT_TIME,
+        'timestamp': FORMAT_TIMESTAMP
+    }
+
+    return {f: now.strftime(formats[f]) for f in fields}
+
+
+@contextlib.contextmanager
+def _parse_context():
+    """Snapshots the date substitution values for all strings parsed within"""
+    context = _date_values(datetime.datetime.now())
+    token = _PARSE_CONTEXT.set(context)
+
+    try:
+        yield context
+    finally:
+        _PARSE_CONTEXT.reset(token)
+
+
+@functools.lru_cache(maxsize=256)
+def _template_fields(input):
+    """Returns the set of top level field names referenced by a format string"""
+    return frozenset(re.split(r'[.\[]', f, maxsplit=1)[0]
+                     for _, f, _, _ in string.Formatter().parse(input)
+                     if f)
+
+
 def get_auth(obj):
     """Resolve authentication handler for a given object"""
-    if obj['type'].upper() in AUTH:
-        return AUTH[obj['type'].upper()](obj)
+    func = AUTH.get(obj['type'])
+
+    return func(obj) if func is not None else None
 
 
 def init_logging(config):
@@ -489,20 +876,44 @@ def init_logging(config):
 
 def loads(data):
     """
-    Loads configuration data from a JSON string
+    Loads configuration data from a JSON string. Object keys are normalized
+    to lowercase.
 
     Args:
         data (str): JSON string to parse.
     """
-    return json.loads(data, object_pairs_hook=CaseInsensitiveDict)
+    if orjson is not None:
+        try:
+            return _lower_keys(orjson.loads(data))
+        except orjson.JSONDecodeError:
+            # defer to the standard library for anything orjson rejects
+            pass
+
+    return json.loads(data, object_pairs_hook=_lower_pairs)
 
 
 def load(file):
     """
-    Loads configuration data from a JSON file
+    Loads configuration data from a JSON file. Object keys are normalized
+    to lowercase.
 
     Args:
         file (str): File path to load.
     """
     with open(file, 'r') as fp:
-        return json.load(fp, object_pairs_hook=CaseInsensitiveDict)
+        return loads(fp.read())
+
+
+def _lower_pairs(pairs):
+    """JSON object hook, normalizes keys to lowercase"""
+    return {k.lower(): v for k, v in pairs}
+
+
+def _lower_keys(obj):
+    """Recursively normalizes parsed JSON object keys to lowercase"""
+    if isinstance(obj, Mapping):
+        return {k.lower(): _lower_keys(v) for k, v in obj.items()}
+    elif isinstance(obj, list):
+        return [_lower_keys(x) for x in obj]
+
+    return obj
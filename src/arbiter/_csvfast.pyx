@@ -0,0 +1,56 @@
+# Copyright © 2020 R.A. Stern
+# SPDX-License-Identifier: LGPL-3.0-or-later
+# cython: language_level=3
+
+cimport cython
+from libc.stdlib cimport free, malloc
+
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def iter_rows(reader, list header, frozenset keep=None, restval=None, restkey=None):
+    """
+    Yields the remaining rows from `reader` as dictionaries keyed by `header`,
+    keeping only the fields in `keep`, or all fields if `keep` is ``None``.
+    Cells beyond the header are kept as a list under `restkey`.
+    """
+    cdef list idx = [i for i, h in enumerate(header) if keep is None or h in keep]
+    cdef list names = [header[i] for i in idx]
+    cdef Py_ssize_t width = len(header)
+    cdef Py_ssize_t count = len(idx)
+    cdef bint extra = keep is None or restkey in keep
+    cdef Py_ssize_t i, n
+    cdef Py_ssize_t *cols = <Py_ssize_t *> malloc((count or 1) * sizeof(Py_ssize_t))
+    cdef list row
+    cdef dict item
+
+    if cols is NULL:
+        raise MemoryError()
+
+    try:
+        # column offsets as C integers, so the inner loop avoids boxing
+        for i in range(count):
+            cols[i] = idx[i]
+
+        for row in reader:
+            n = len(row)
+
+            # blank lines are skipped and short rows padded, as with DictReader
+            if n == 0:
+                continue
+
+            if n < width:
+                row += [restval] * (width - n)
+
+            item = {}
+
+            for i in range(count):
+                item[names[i]] = row[cols[i]]
+
+            if extra and n > width:
+                item[restkey] = row[width:]
+
+            yield item
+    finally:
+        free(cols)
@@ -1,6 +1,15 @@
 # Copyright © 2020 R.A. Stern
 # SPDX-License-Identifier: LGPL-3.0-or-later
 
+import os
+
+try:
+    import pybase64 as base64
+except ImportError:
+    import base64
+
+
+
 def basic(obj):
     """
     Basic username & password authentication scheme.
@@ -13,12 +22,10 @@ def basic(obj):
         Although username and plaintext password authentication is supported, it
         should not be used outside of a test environment.
     """
-    import base64
-
     return {
         'username': obj['username'],
         'password': obj['password'],
-        'auth': base64.b64encode(f"{obj['username']}:{obj['password']}".encode())
+        'auth': base64.b64encode(f"{obj['username']}:{obj['password']}".encode()).decode('ascii')
     }
 
 
@@ -30,9 +37,7 @@ def auth_string(obj):
         A :py:class:`dict` of credentials including an 'auth' key
         continaing the base64 'basic auth' representation of the data.
     """
-    import base64
-
-    u, p = base64.b64decode(obj['credential']).decode().split(':')
+    u, p = base64.b64decode(obj['credential'], validate=True).decode().split(':')
 
     return {
         'username': u,
@@ -49,6 +54,6 @@ def os_env(obj):
         A :py:class:`dict` with all values replaced by their respective
         environment variables.
     """
-    import os
+    env = os.environ
 
-    return {x: os.environ.get(obj[x]) for x in obj if x != 'type'}
+    return {k: env.get(v) for k, v in obj.items() if k != 'type'}
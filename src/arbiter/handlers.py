@@ -1,14 +1,184 @@
 # Copyright © 2020 R.A. Stern
 # SPDX-License-Identifier: LGPL-3.0-or-later
 
+import atexit
+from concurrent.futures import ThreadPoolExecutor
 import csv
+from email import contentmanager
+from email.message import EmailMessage
+from email.utils import COMMASPACE
+import functools
 import json
+import mimetypes
+import mmap
+import operator
 import os
-
+import queue
+import smtplib
+import threading
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    import pybase64 as base64
+except ImportError:
+    import base64
 from urllib.parse import urlparse
 from umsg.mixins import LoggingMixin
 import arbiter
 
+# file I/O buffer size for file handlers
+_BUFFER_SIZE = 1 << 20
+
+# minimum attachment size to memory map, rather than read
+_MMAP_THRESHOLD = 1 << 16
+
+# smtp options consumed by EmailHandler, rather than passed to smtplib
+_SMTP_RESERVED = frozenset((
+    'host',
+    'ssl',
+    'tls',
+    'lmtp',
+    'keyfile',
+    'certfile',
+    'username',
+    'password',
+    'authentication',
+    'max_messages_per_connection'
+))
+
+# configurable email message headers
+_EMAIL_HEADERS = frozenset((
+    'orig-date',
+    'from',
+    'sender',
+    'reply-to',
+    'to',
+    'cc',
+    'bcc',
+    'subject',
+    'comments',
+    'keywords',
+    'optional-field'
+))
+
+# load the system MIME database once, rather than on first attachment
+mimetypes.init()
+
+try:
+    from arbiter._csvfast import iter_rows as _iter_rows
+except ImportError:
+    def _iter_rows(reader, header, keep=None, restval=None, restkey=None):
+        """
+        Yields the remaining rows from `reader` as dictionaries keyed by `header`,
+        keeping only the fields in `keep`, or all fields if `keep` is ``None``.
+        Cells beyond the header are kept as a list under `restkey`.
+        """
+        idx = [i for i, h in enumerate(header) if keep is None or h in keep]
+        names = [header[i] for i in idx]
+        width = len(header)
+        extra = keep is None or restkey in keep
+
+        if len(idx) == width:
+            # every column is kept, and zip stops at the header width
+            project = None
+        elif len(idx) > 1:
+            project = operator.itemgetter(*idx)
+        else:
+            # itemgetter returns a bare value, rather than a tuple, for one index
+            project = lambda row: [row[i] for i in idx]
+
+        for row in reader:
+            # blank lines are skipped and short rows padded, as with DictReader
+            if not row:
+                continue
+
+            if len(row) < width:
+                row += [restval] * (width - len(row))
+
+            item = dict(zip(names, row if project is None else project(row)))
+
+            if extra and len(row) > width:
+                item[restkey] = row[width:]
+
+            yield item
+
+
+@functools.lru_cache(maxsize=512)
+def _parse_resource(resource):
+    """Returns the parsed URL of a resolved resource string."""
+    # keyed on the resolved string, as date substitutions change between runs
+    return urlparse(resource)
+
+
+@functools.lru_cache(maxsize=256)
+def _guess(ext):
+    """Returns the (maintype, subtype) pair for a file extension."""
+    ctype, encoding = mimetypes.guess_type('file' + ext)
+
+    # unknown, treat as binary
+    if ctype is None or encoding is not None:
+        ctype = 'application/octet-stream'
+
+    return tuple(ctype.split('/', 1))
+
+
+def _set_bytes_content(msg, data, maintype, subtype, cte='base64', **kwargs):
+    """Sets binary attachment content, base64 encoding the payload in one call."""
+    # encodebytes wraps at 76 characters, matching the default policy
+    if cte != 'base64' or msg.policy.max_line_length != 78:
+        return contentmanager.set_bytes_content(msg, data, maintype, subtype, cte, **kwargs)
+
+    # headers are set by the standard handler, over an empty payload
+    contentmanager.set_bytes_content(msg, b'', maintype, subtype, cte, **kwargs)
+    msg.set_payload(base64.encodebytes(data).decode('ascii'))
+
+
+# content manager for attachments, see :py:func:`_set_bytes_content`
+_ATTACHMENT_MANAGER = contentmanager.ContentManager()
+_ATTACHMENT_MANAGER.add_set_handler(bytes, _set_bytes_content)
+_ATTACHMENT_MANAGER.add_set_handler(bytearray, _set_bytes_content)
+_ATTACHMENT_MANAGER.add_set_handler(memoryview, _set_bytes_content)
+
+
+def _smtp_quit(smtp):
+    """Closes an SMTP connection, tolerating a server which has already gone."""
+    try:
+        smtp.quit()
+    except (smtplib.SMTPException, OSError):
+        smtp.close()
+
+
+class _SmtpConnection:
+    """An SMTP connection shared by email handlers with the same settings."""
+    __slots__ = (
+        'lock',
+        'sent',
+        'smtp'
+    )
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.sent = 0
+        self.smtp = None
+
+    def close(self):
+        if self.smtp is not None:
+            _smtp_quit(self.smtp)
+            self.smtp = None
+
+
+# persistent SMTP connections, keyed by connection settings
+_SMTP_CONNECTIONS = {}
+
+
+@atexit.register
+def _close_smtp_connections():
+    for conn in list(_SMTP_CONNECTIONS.values()):
+        conn.close()
+
 
 
 class BaseHandler(LoggingMixin):
@@ -32,61 +202,59 @@ class BaseHandler(LoggingMixin):
             passed to the handler subroutine.
         resource (str): Resource identifier.
     """
-    __slots__ = [
+    __slots__ = (
         'authentication',
         'config',
         'options',
         'resource'
-    ]
+    )
 
     def __init__(self, config, **kwargs):
         super().__init__()
 
         self.config = config
-        self.options = config.get('options', {})
+        self.options = dict(config.get('options') or {})
+        self.options.update(kwargs)
         self.authentication = config.get('authentication', None)
         self.resource = arbiter.parse_string(config.get('resource', None))
 
-        if kwargs:
-            for k in kwargs:
-                self.options[k] = kwargs[k]
-
 
 class FileHandler(BaseHandler):
     """
     Generic file handler template. Provides filepath resolution to all file
-    handlers, and removes files at program termination.
+    handlers, and removes files at program termination. Inheriting handlers
+    implement :py:meth:`get` and :py:meth:`set` as required.
 
     Attributes:
         filename (str): Resolved filename path.
     """
 
-    __slots__ = [
+    __slots__ = (
+        '_filtered_options',
         '_options_exclude',
         'filename'
-    ]
+    )
 
     def __init__(self, config, **kwargs):
         super().__init__(config, **kwargs)
 
-        if self.resource.startswith('file:'):
-            url = urlparse(self.resource)
-            self.filename = url.path
+        # only URIs with an authority component require full parsing
+        if self.resource.startswith('file://'):
+            self.filename = _parse_resource(self.resource).path
+        elif self.resource.startswith('file:'):
+            self.filename = self.resource[5:]
         else:
             self.filename = self.resource
 
         self._options_exclude = ['keepfile']
+        self._filtered_options = None
 
     def _options(self):
-        return {k: v for k, v in self.options.items() if k not in self._options_exclude}
+        # cached, must be reset to None whenever options are modified
+        if self._filtered_options is None:
+            self._filtered_options = {k: v for k, v in self.options.items() if k not in self._options_exclude}
 
-    def get(self):
-        """Data getter stub, to be implemented by inheriting sub-class."""
-        pass
-
-    def set(self):
-        """Data setter stub, to be implemented by inheriting sub-class."""
-        pass
+        return self._filtered_options
 
     def atexit(self):
         """Will attempt to remove the file created at exit."""
@@ -101,8 +269,9 @@ class FileHandler(BaseHandler):
 class CsvFile(FileHandler):
     """
     Provides CSV serialization and deserialization utilizing the standard Python
-    CSV library. By default :py:class:`CsvFile` utilizes :py:meth:`~csv.DictReader`
-    and :py:meth:`~csv.DictWriter` objects.
+    CSV library. :py:class:`CsvFile` utilizes :py:func:`~csv.reader` and
+    :py:func:`~csv.writer` objects, reading and writing rows as dictionaries
+    keyed by the header row.
 
     Notes:
         v1.1.0 - fields is deprecated, and will be removed in v2.0. Use fieldnames.
@@ -110,69 +279,92 @@ class CsvFile(FileHandler):
     Args:
         fieldnames (list): Input/output whitelist of fields to filter. All fields are kept
             if value is None. (Default: ``None``)
+        restval (str): Value used for missing fields. (Default: ``None`` on input,
+            ``''`` on output)
+        restkey (str): Input key for the list of fields beyond the header.
+            (Default: ``None``)
     """
+    __slots__ = (
+        '_fieldset',
+    )
+
     def __init__(self, config, **kwargs):
         # deprecated - remove in 2.0, for backwards compatibility
         if 'fields' in kwargs:
-            kwargs['fieldnames'] = kwargs['fields']
-            del kwargs['fields']
+            kwargs['fieldnames'] = kwargs.pop('fields')
 
         super().__init__(config, **kwargs)
 
-        self._options_exclude.append('fields')
+        # remaining options are csv dialect and formatting parameters
+        self._options_exclude.extend(['fields', 'fieldnames', 'restkey', 'restval', 'extrasaction'])
 
-    def get(self):
-        """Uses :py:meth:`~csv.DictReader` to import file contents."""
-        with open(self.filename, 'r') as fp:
-            reader = csv.DictReader(fp, **self._options())
+        fieldnames = self.options.get('fieldnames')
+        self._fieldset = frozenset(fieldnames) if fieldnames else None
 
-            if self.options['fieldnames']:
-                data = []
+    def iter_rows(self):
+        """Uses :py:func:`~csv.reader` to yield file contents one row at a time."""
+        with open(self.filename, 'r', buffering=_BUFFER_SIZE, newline='') as fp:
+            reader = csv.reader(fp, **self._options())
+            header = next(reader, None)
 
-                for row in reader:
-                    for f in row.keys():
-                        if f not in self.options['fieldnames']:
-                            del row[f]
-                    data.append(row)
+            if header is not None:
+                yield from _iter_rows(reader, header, self._fieldset,
+                                      restval=self.options.get('restval'),
+                                      restkey=self.options.get('restkey'))
 
-                return data
-            else:
-                return [row for row in reader]
+    def get(self):
+        """Imports file contents, see :py:meth:`iter_rows`."""
+        return list(self.iter_rows())
 
     def set(self, data):
-        """Uses :py:meth:`~csv.DictWriter` to export file contents."""
-        if 'fieldnames' not in self.options:
-            self.options['fieldnames'] = data[0].keys()
-
-        # extrasaction is explicitly disabled here
-        self.options['extrasaction'] = 'ignore'
-
-        with open(self.filename, 'w') as fp:
-            writer = csv.DictWriter(fp, **self._options())
-            writer.writeheader()
+        """Uses :py:func:`~csv.writer` to export file contents."""
+        fieldnames = list(self.options.get('fieldnames') or data[0].keys())
+        restval = self.options.get('restval', '')
 
-            for row in data:
-                writer.writerow(row)
+        with open(self.filename, 'w', buffering=_BUFFER_SIZE, newline='') as fp:
+            writer = csv.writer(fp, **self._options())
+            writer.writerow(fieldnames)
+            # fields not in fieldnames are ignored
+            writer.writerows([[row.get(k, restval) for k in fieldnames] for row in data])
 
 
 class JsonFile(FileHandler):
     """
     Provides JSON serialization and deserialization utilizing the standard Python
-    JSON library. By default :py:class:`JsonFile` utilizes :py:func:`~json.load`
-    and :py:func:`~csv.dump` functions.
+    JSON library. By default :py:class:`JsonFile` utilizes :py:func:`~json.loads`
+    and :py:func:`~json.dumps` functions. If `orjson` is installed, it is used
+    for input instead when no options are given, as it does not support the
+    standard library keyword options. Output always uses the standard library,
+    as orjson writes non-finite floats as ``null`` and uses a different layout.
     """
     def __init__(self, config, **kwargs):
         super().__init__(config, **kwargs)
 
     def get(self):
-        """Uses :py:func:`~json.load` to import file contents."""
-        with open(self.filename, 'r') as fp:
-            return json.load(fp, **self._options())
+        """Uses :py:func:`~json.loads` to import file contents."""
+        options = self._options()
+
+        if orjson is not None and not options:
+            with open(self.filename, 'rb') as fp:
+                buf = fp.read()
+
+            try:
+                return orjson.loads(buf)
+            except orjson.JSONDecodeError:
+                # defer to the standard library for anything orjson rejects,
+                # such as NaN or integers wider than 64 bits
+                return json.loads(buf)
+
+        # parsed from a single read, rather than incrementally from the file
+        with open(self.filename, 'r', buffering=_BUFFER_SIZE) as fp:
+            return json.loads(fp.read(), **options)
 
     def set(self, data):
-        """Uses :py:func:`~json.dump` to export file contents."""
-        with open(self.filename, 'w') as fp:
-            json.dump(data, fp, **self._options())
+        """Uses :py:func:`~json.dumps` to export file contents."""
+        buf = json.dumps(data, **self._options())
+
+        with open(self.filename, 'w', buffering=_BUFFER_SIZE) as fp:
+            fp.write(buf)
 
 
 class ConnectionHandler(BaseHandler):
@@ -206,71 +398,71 @@ class HttpHandler(ConnectionHandler):
         port (int): Connection port on host
     """
 
-    __slots__ = [
+    __slots__ = (
         'authority',
         'host',
         'port',
         'path',
         'query',
         'secure'
-    ]
+    )
 
     def __init__(self, config, **kwargs):
         super().__init__(config, **kwargs)
 
-        url = urlparse(self.resource)
+        url = _parse_resource(self.resource)
 
         self.authority = url.netloc
         self.host = url.hostname
         self.path = url.path
         self.query = url.query
-        self.secure = True if url.scheme == 'https' else False
-        self.port = url.port if url.port else (443 if self.secure else 80)
+        self.secure = url.scheme == 'https'
+        self.port = url.port or (80, 443)[self.secure]
 
 
 class NotificationHandler(BaseHandler):
     """
-    Generic notification handler template.
+    Generic notification handler template. Inheriting handlers must implement
+    :py:meth:`send`.
 
     Attributes:
         errors (list): List of error messages collected during processing.
         files (list): List of files which will be sent with the notification.
     """
 
-    __slots__ = [
+    __slots__ = (
         'errors',
         'files'
-    ]
+    )
 
     def __init__(self, config, **kwargs):
-        if 'files' in kwargs:
-            self.files = kwargs['files']
-            del kwargs['files']
-        else:
-            self.files = []
-
-        if 'errors' in kwargs:
-            self.errors = kwargs['errors']
-            del kwargs['errors']
-        else:
-            self.errors = []
+        self.files = kwargs.pop('files', [])
+        self.errors = kwargs.pop('errors', [])
 
         super().__init__(config, **kwargs)
 
-    def send(self):
-        """Notification action stub, to be implemented by inheriting sub-class."""
-        pass
-
 
 class EmailHandler(NotificationHandler):
     """
     Sends email message notifications using an STMP server.
+
+    Attributes:
+        emailheaders (frozenset): Email headers which may be set by configuration.
     """
-    __slots__ = [
+    __slots__ = (
         'default_body_error',
-        '_emailheaders',
-        '_smtpexclude'
-    ]
+        '_body',
+        '_body_error',
+        '_headers',
+        '_smtp_auth',
+        '_smtp_class',
+        '_smtp_conn',
+        '_smtp_limit',
+        '_smtp_options',
+        '_smtp_tls'
+    )
+
+    emailheaders = _EMAIL_HEADERS
 
     def __init__(self, config, **kwargs):
         super().__init__(config, **kwargs)
@@ -281,31 +473,18 @@ class EmailHandler(NotificationHandler):
         {errors}
         """
 
-        self._emailheaders = [
-            'orig-date',
-            'from',
-            'sender',
-            'reply-to',
-            'to',
-            'cc',
-            'bcc',
-            'subject',
-            'comments',
-            'keywords',
-            'optional-field'
-        ]
-
-        self.__smtp_exclude = [
-            'host',
-            'ssl',
-            'tls',
-            'lmtp',
-            'keyfile',
-            'certfile',
-            'username',
-            'password',
-            'authentication'
-        ]
+        # body templates are resolved once, substitution happens at send time
+        email = self.options.get('email', {})
+        self._body = email.get('body')
+        self._body_error = email.get('body_error', self.default_body_error)
+
+        # headers are normalized to strings once, list values being joined, and
+        # matched case-insensitively as header names are
+        self._headers = {
+            k: COMMASPACE.join(v) if isinstance(v, list) else v
+            for k, v in email.items()
+            if k.lower() in self.emailheaders
+        }
 
         if 'smtp' not in self.options:
             self.options['smtp'] = {
@@ -318,9 +497,6 @@ class EmailHandler(NotificationHandler):
             }
 
         if self.options['smtp'].get('authentication', None):
-            import arbiter
-            from arbiter import auth
-
             try:
                 type = self.options['smtp']['authentication']['type']
                 auth = arbiter.AUTH[type](self.options['smtp']['authentication'])
@@ -330,67 +506,188 @@ class EmailHandler(NotificationHandler):
             except Exception:
                 pass
 
-    def __smtp_options(self):
-        return {k: v for k, v in self.options['smtp'].items() if k not in self.__smtp_exclude}
+        # connection parameters are fixed by configuration, and resolved once
+        smtp = self.options['smtp']
+
+        if smtp.get('ssl', False):
+            self._smtp_class = smtplib.SMTP_SSL
+        elif smtp.get('lmtp', False):
+            self._smtp_class = smtplib.LMTP
+        else:
+            self._smtp_class = smtplib.SMTP
+
+        if smtp.get('tls', False):
+            self._smtp_tls = {x: smtp[x] for x in smtp if x in ['keyfile', 'certfile']}
+        else:
+            self._smtp_tls = None
+
+        if smtp.get('username', None) and smtp.get('password', None):
+            self._smtp_auth = (smtp['username'], smtp['password'])
+        else:
+            self._smtp_auth = None
+
+        self._smtp_limit = smtp.get('max_messages_per_connection')
+
+        # remaining options are passed through to the smtplib class
+        self._smtp_options = {k: v for k, v in smtp.items() if k not in _SMTP_RESERVED}
+
+        # handlers are created per notification, so the persistent connection
+        # is shared by all handlers with the same connection settings
+        key = repr((self._smtp_class, smtp.get('host'), sorted(self._smtp_options.items()),
+                    self._smtp_tls and sorted(self._smtp_tls.items()), self._smtp_auth))
+        self._smtp_conn = _SMTP_CONNECTIONS.setdefault(key, _SmtpConnection())
 
     def send(self):
-        from email.message import EmailMessage
-        from email.utils import COMMASPACE
-        import mimetypes
-        import smtplib
+        msg = self._message()
+
+        with self._smtp_conn.lock:
+            self._get_smtp().send_message(msg)
+            self._smtp_conn.sent += 1
+
+    def send_many(self, messages, max_connections=5, messages_per_connection=100):
+        """
+        Sends prepared messages concurrently, each worker thread holding its
+        own SMTP connection. The handler's persistent connection is not used.
+
+        Args:
+            messages (list): :py:class:`~email.message.EmailMessage` objects to send.
+            max_connections (int): Maximum number of concurrent connections.
+                (Default: ``5``)
+            messages_per_connection (int): Number of messages sent before a
+                connection is closed and reopened, ``None`` for no limit.
+                (Default: ``100``)
+
+        Raises:
+            ValueError: If `max_connections` is less than 1.
+            Exception: The first exception raised by a worker, once all workers
+                have finished.
+        """
+        if max_connections < 1:
+            raise ValueError(f"max_connections must be at least 1, not {max_connections}")
+
+        pending = queue.Queue()
+
+        for msg in messages:
+            pending.put(msg)
+
+        def worker():
+            smtp = None
+            sent = 0
+
+            try:
+                while True:
+                    try:
+                        msg = pending.get_nowait()
+                    except queue.Empty:
+                        return
+
+                    if smtp is None or (messages_per_connection and sent >= messages_per_connection):
+                        if smtp is not None:
+                            _smtp_quit(smtp)
+                            smtp = None
 
+                        smtp = self._open_smtp()
+                        sent = 0
+
+                    smtp.send_message(msg)
+                    sent += 1
+            finally:
+                if smtp is not None:
+                    _smtp_quit(smtp)
+
+        workers = min(max_connections, pending.qsize())
+
+        if not workers:
+            return
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(worker) for _ in range(workers)]
+
+        for f in futures:
+            f.result()
+
+    def _message(self):
+        """Builds the notification message from the handler configuration."""
         msg = EmailMessage()
 
         if self.errors:
             error_msg = '\n\n'.join(self.errors)
-
-            if 'body_error' not in self.options['email']:
-                body = self.default_body_error
-            else:
-                body = self.options['email']['body_error']
-
-            msg.set_content(arbiter.parse_string(body, errors=error_msg))
+            msg.set_content(arbiter.parse_string(self._body_error, errors=error_msg))
         else:
-            msg.set_content(arbiter.parse_string(self.options['email']['body']))
+            msg.set_content(arbiter.parse_string(self._body))
 
         # write headers
-        for k in self.options['email']:
-            if k in self._emailheaders:
-                if isinstance(self.options['email'][k], list):
-                    msg[k] = arbiter.parse_string(COMMASPACE.join(self.options['email'][k]))
-                else:
-                    msg[k] = arbiter.parse_string(self.options['email'][k])
+        for k, v in self._headers.items():
+            msg[k] = arbiter.parse_string(v) if '{' in v else v
 
         # attach files
         for file in self.files:
-            ctype, encoding = mimetypes.guess_type(file)
+            # extensions are folded to lowercase, so that case variants share a cache entry
+            maintype, subtype = _guess(os.path.splitext(file)[1].lower())
 
-            # unknown, treat as binary
-            if ctype is None or encoding is not None:
-                ctype = 'application/octet-stream'
+            with open(file, 'rb') as fp:
+                # large files are mapped rather than copied into memory
+                if os.fstat(fp.fileno()).st_size < _MMAP_THRESHOLD:
+                    msg.add_attachment(fp.read(),
+                                   content_manager=_ATTACHMENT_MANAGER,
+                                   maintype=maintype,
+                                   subtype=subtype,
+                                   filename=os.path.basename(file))
+                else:
+                    with mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as mm, \
+                    memoryview(mm) as data:
+                        msg.add_attachment(data,
+                                       content_manager=_ATTACHMENT_MANAGER,
+                                       maintype=maintype,
+                                       subtype=subtype,
+                                       filename=os.path.basename(file))
 
-            maintype, subtype = ctype.split('/', 1)
+        return msg
 
-            with open(file, 'rb') as fp:
-                msg.add_attachment(fp.read(),
-                               maintype=maintype,
-                               subtype=subtype,
-                               filename=os.path.basename(file))
-
-        if self.options['smtp'].get('ssl', False):
-            klass = smtplib.SMTP_SSL
-        elif self.options['smtp'].get('lmtp', False):
-            klass = smtplib.LMTP
-        else:
-            klass = smtplib.SMTP
+    def _get_smtp(self):
+        """
+        Returns the shared SMTP connection, connecting first if required. The
+        connection's lock must be held.
+        """
+        conn = self._smtp_conn
+
+        if conn.smtp is not None:
+            # connections past their message limit, stale or dropped are replaced
+            if not self._smtp_limit or conn.sent < self._smtp_limit:
+                try:
+                    if conn.smtp.noop()[0] == 250:
+                        return conn.smtp
+                except (smtplib.SMTPException, OSError):
+                    pass
+
+            conn.close()
+
+        conn.smtp = self._open_smtp()
+        conn.sent = 0
+
+        return conn.smtp
 
-        with klass(host=self.options['smtp']['host'], **self.__smtp_options()) as smtp:
-            if self.options['smtp'].get('tls', False):
-                tlsargs = {x: self.options['smtp'][x] for x in self.options['smtp'] if x in ['keyfile', 'certfile']}
-                smtp.starttls(**tlsargs)
+    def _open_smtp(self):
+        """Opens a new SMTP connection, secured and authenticated as configured."""
+        smtp = self._smtp_class(host=self.options['smtp']['host'], **self._smtp_options)
 
-            if self.options['smtp'].get('username', None) \
-            and self.options['smtp'].get('password', None):
-                smtp.login(self.options['smtp']['username'], self.options['smtp']['password'])
+        try:
+            if self._smtp_tls is not None:
+                smtp.starttls(**self._smtp_tls)
+
+            if self._smtp_auth is not None:
+                smtp.login(*self._smtp_auth)
+        except BaseException:
+            smtp.close()
+            raise
+
+        return smtp
 
-            smtp.send_message(msg)
+    def disconnect(self):
+        """Closes the persistent SMTP connection, if open."""
+        with self._smtp_conn.lock:
+            self._smtp_conn.close()
+
+    def atexit(self):
+        """Closes the persistent SMTP connection at exit."""
+        self.disconnect()
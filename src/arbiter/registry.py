@@ -1,9 +1,17 @@
 # Copyright © 2020 R.A. Stern
 # SPDX-License-Identifier: LGPL-3.0-or-later
 
+import functools
+
 from arbiter.exceptions import RegistrationError
 
 
+@functools.lru_cache(maxsize=1024)
+def _u(s):
+    """Returns the canonical, upper case, registry key for `s`."""
+    return s.upper()
+
+
 class Registry:
     """The registry class is a special :py:class:`dict` used for tracking
     registered types, and preventing name collisions.
@@ -16,16 +24,15 @@ class Registry:
     def __init__(self, required=None, registry=None):
         self.__required = required or []
         self.__registry = registry or {}
-        pass
 
     def __len__(self):
         return len(self.__registry)
 
     def __getitem__(self, key):
-        return self.__registry[key.upper()]
+        return self.__registry[_u(key)]
 
     def __contains__(self, item):
-        return True if item.upper() in self.__registry else False
+        return _u(item) in self.__registry
 
     def __repr__(self):
         return self.__registry.__repr__()
@@ -33,6 +40,10 @@ class Registry:
     def __str__(self):
         return self.__registry.__str__()
 
+    def get(self, key, default=None):
+        """Returns the reference registered to `key`, or `default` if not found."""
+        return self.__registry.get(_u(key), default)
+
     def register(self, name, ref):
         """Register a new named reference.
 
@@ -43,10 +54,12 @@ class Registry:
         Raises:
             RegistrationError: If the `name` is already registered.
         """
-        if name.upper() in self.__registry:
+        key = _u(name)
+
+        if key in self.__registry:
             raise RegistrationError(f"Name '{name}' is already registered.")
         else:
-            self.__registry[name.upper()] = ref
+            self.__registry[key] = ref
 
     def unregister(self, name):
         """Unregister a named reference.
@@ -58,7 +71,9 @@ class Registry:
             RegistrationError: If the `name` does not exist or is a protected
                 system name.
         """
-        if name.upper() not in self.__required:
-            del self.__registry[name.upper()]
+        key = _u(name)
+
+        if key not in self.__required:
+            del self.__registry[key]
         else:
             raise RegistrationError('Unable to remove required entry.')